@@ -1,26 +1,136 @@
 import random
+from collections import deque
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 import os
 import json
-from dotenv import load_dotenv
-
-load_dotenv()
+import numpy as np
+
+# Moves are encoded as int8: rock=0, paper=1, scissors=2
+_MOVES = ("rock", "paper", "scissors")
+_MOVE_INDEX = {"rock": 0, "paper": 1, "scissors": 2}
+_COUNTER = {"rock": "paper", "paper": "scissors", "scissors": "rock"}
+_COUNTER_INDEX = np.array([1, 2, 0], dtype=np.int8)  # move that beats each encoded move
+_WINDOW = 7  # number of recent opponent moves used for pattern detection
+
+# Catalog of simple opponent policies: _POLICY_NEXT[k, prev] is the move policy k
+# plays after prev (repeat, play what beats prev, play what prev beats)
+_POLICY_NEXT = np.array([[0, 1, 2], [1, 2, 0], [2, 0, 1]], dtype=np.int8)
+_POLICY_RESPONSE = _COUNTER_INDEX[_POLICY_NEXT]  # our counter to each policy, by prev
+_POLICY_MIN_ROUNDS = 20     # don't specialize before this many rounds
+_POLICY_REFIT_EVERY = 10    # rounds between catalog fits
+_POLICY_MIN_MATCH = 0.7     # share of observed transitions the policy must explain
+
+# Robot presentation tables, built once at import
+_ANIMATIONS = MappingProxyType({
+    "confident": "power_up",
+    "victorious": "celebration",
+    "focused": "thinking",
+    "determined": "battle_stance",
+    "neutral": "idle"
+})
+
+# Inner mappings are read-only too; _get_mood_effects hands out copies
+_MOOD_EFFECTS = MappingProxyType({
+    "confident": MappingProxyType({"glow": "blue", "intensity": 0.8}),
+    "victorious": MappingProxyType({"glow": "gold", "intensity": 1.0, "particles": True}),
+    "focused": MappingProxyType({"glow": "purple", "intensity": 0.6}),
+    "determined": MappingProxyType({"glow": "red", "intensity": 0.9}),
+    "neutral": MappingProxyType({"glow": "white", "intensity": 0.4})
+})
+
+_TAUNTS = (
+    "Let's see what you've got!",
+    "My circuits are ready for battle!",
+    "Calculating your next move...",
+    "Time to show my digital supremacy!",
+    "Ready for another round, human?",
+    "My algorithms are unbeatable!",
+    "Let the games begin!",
+    "Prepare to be digitally dominated!"
+)
 
 class AIAgent:
     def __init__(self):
         # For now, we'll use a strategic random approach
         # Later we can integrate with Langchain when network is stable
-        self.api_key = os.getenv("GOOGLE_API_KEY")
+        self.api_key = os.environ.get("GOOGLE_API_KEY")
         self.personality_traits = [
             "playful", "strategic", "unpredictable", "competitive", "friendly"
         ]
         self.current_mood = "neutral"
-        
-    async def make_move(self, opponent_last_move: Optional[str] = None, game_history: List[Dict] = None) -> str:
+
+        # Rolling window of encoded opponent moves and the transitions inside it
+        self._buf = np.zeros(_WINDOW, dtype=np.int8)
+        self._n = 0
+        self._head = 0
+        self._trans = np.zeros((3, 3), dtype=np.int32)
+        self._rng = np.random.default_rng()
+
+        # Whether the opponent beat us in each of the last 3 rounds
+        self._recent_countered = deque(maxlen=3)
+
+        # Whole-session transitions, used to match the opponent to a catalog policy;
+        # while a policy matches, _policy_response replaces the strategy blend
+        self._rounds = 0
+        self._trans_total = np.zeros((3, 3), dtype=np.int32)
+        self._policy_response: Optional[np.ndarray] = None
+
+    def record_round(self, player1_move: str, player2_move: str, result: str):
+        """Update rolling opponent stats once a round is resolved (O(1) per round)"""
+        self._push_move(player1_move)
+        if player1_move in _MOVE_INDEX and player2_move in _MOVE_INDEX:
+            self._recent_countered.append(result == "player1")
+
+        self._rounds += 1
+        if self._rounds >= _POLICY_MIN_ROUNDS and self._rounds % _POLICY_REFIT_EVERY == 0:
+            self._fit_policy()
+
+    def _fit_policy(self):
+        """Match session transitions against the policy catalog and specialize if one fits"""
+        total = self._trans_total.sum()
+        if not total:
+            self._policy_response = None
+            return
+
+        # Share of observed transitions each policy would have predicted
+        match = self._trans_total[np.arange(3), _POLICY_NEXT].sum(axis=1) / total
+        best = int(match.argmax())
+        self._policy_response = _POLICY_RESPONSE[best] if match[best] > _POLICY_MIN_MATCH else None
+
+    def _push_move(self, move: str):
+        """Append an opponent move to the rolling window, keeping transitions in sync"""
+        cur = _MOVE_INDEX.get(move)
+        if cur is None:
+            return
+
+        if self._n == _WINDOW:
+            # Oldest move drops out of the window along with its outgoing transition
+            oldest = self._buf[self._head]
+            self._trans[oldest, self._buf[(self._head + 1) % _WINDOW]] -= 1
+        else:
+            self._n += 1
+
+        if self._n > 1:
+            prev = self._buf[(self._head - 1) % _WINDOW]
+            self._trans[prev, cur] += 1
+            self._trans_total[prev, cur] += 1
+
+        self._buf[self._head] = cur
+        self._head = (self._head + 1) % _WINDOW
+
+    def make_move(self, opponent_last_move: Optional[str] = None, game_history: List[Dict] = None) -> str:
         """Generate AI move using optimized strategic logic"""
         try:
+            # Seed rolling stats from history once; afterwards record_round keeps them current
+            if self._n == 0 and game_history:
+                for round_data in game_history[-_WINDOW:]:
+                    self.record_round(round_data.get("player1_move", ""),
+                                      round_data.get("player2_move", ""),
+                                      round_data.get("result", "tie"))
+
             # Use enhanced strategic logic (much faster than LLM calls)
-            ai_move = self._strategic_move(opponent_last_move, game_history or [])
+            ai_move = self._strategic_move(opponent_last_move)
 
             # Update mood based on move
             self._update_mood(ai_move, opponent_last_move)
@@ -30,123 +140,82 @@ class AIAgent:
         except Exception as e:
             print(f"AI Agent error: {e}")
             # Fast fallback
-            return self._fallback_strategy(opponent_last_move, game_history or [])
+            return self._fallback_strategy(opponent_last_move)
     
-    def _prepare_game_context(self, opponent_last_move: Optional[str], game_history: List[Dict]) -> str:
+    def _prepare_game_context(self, opponent_last_move: Optional[str]) -> str:
         """Prepare optimized context for AI decision making (kept for future LLM integration)"""
-        if not game_history:
+        if self._n == 0:
             return "First round - no history"
 
-        # Fast analysis of last 5 moves
-        recent_moves = [round_data.get("player1_move", "") for round_data in game_history[-5:]]
-        valid_moves = [m for m in recent_moves if m in ["rock", "paper", "scissors"]]
-
-        if not valid_moves:
-            return f"Last move: {opponent_last_move or 'none'}"
+        # Last 5 moves from the rolling window, oldest first
+        k = min(self._n, 5)
+        recent = self._buf[(self._head - k + np.arange(k)) % _WINDOW]
+        valid_moves = [_MOVES[m] for m in recent]
 
         # Quick frequency count
-        counts = {"rock": valid_moves.count("rock"),
-                 "paper": valid_moves.count("paper"),
-                 "scissors": valid_moves.count("scissors")}
+        bins = np.bincount(recent, minlength=3)
+        counts = {"rock": int(bins[0]), "paper": int(bins[1]), "scissors": int(bins[2])}
 
         return f"Moves: {valid_moves}, Counts: {counts}, Last: {opponent_last_move or 'none'}"
     
-    def _strategic_move(self, opponent_last_move: Optional[str], game_history: List[Dict]) -> str:
+    def _strategic_move(self, opponent_last_move: Optional[str]) -> str:
         """Enhanced strategic AI move with improved pattern recognition and faster execution"""
-        if not game_history:
-            return random.choice(["rock", "paper", "scissors"])
+        if self._n == 0:
+            return _MOVES[self._rng.integers(3)]
 
-        # Fast analysis of recent moves (last 7 rounds for better pattern detection)
-        recent_moves = [round_data.get("player1_move", "") for round_data in game_history[-7:]]
-        valid_moves = [move for move in recent_moves if move in ["rock", "paper", "scissors"]]
+        prev = self._buf[(self._head - 1) % _WINDOW]
 
-        if not valid_moves:
-            return random.choice(["rock", "paper", "scissors"])
+        if self._policy_response is not None:
+            # Opponent follows a known policy: play its counter directly
+            ai_move = int(self._policy_response[prev])
+        else:
+            ai_move = self._blend_strategies(opponent_last_move, prev)
 
-        # Calculate move frequencies and transitions
-        move_counts = {"rock": 0, "paper": 0, "scissors": 0}
-        transitions = {"rock": {"rock": 0, "paper": 0, "scissors": 0},
-                      "paper": {"rock": 0, "paper": 0, "scissors": 0},
-                      "scissors": {"rock": 0, "paper": 0, "scissors": 0}}
+        # Add some randomness to prevent being too predictable (15% chance)
+        if self._rng.random() < 0.15:
+            ai_move = self._rng.integers(3)
 
-        prev_move = None
-        for move in valid_moves:
-            move_counts[move] += 1
-            if prev_move: 
-                transitions[prev_move][move] += 1
-            prev_move = move
+        return _MOVES[ai_move]
+    
+    def _blend_strategies(self, opponent_last_move: Optional[str], prev: int) -> int:
+        """Weighted vote of frequency, Markov, last-move and random strategies"""
+        # Move frequencies over the rolling window; transitions are maintained on push
+        counts = np.bincount(self._buf[:self._n], minlength=3)
 
-        # Predict opponent's next move using multiple strategies
-        predicted_moves = []
+        # Score each encoded AI move; every strategy adds its weight to one slot
+        scores = np.zeros(3)
 
         # Strategy 1: Counter most frequent move (40% weight)
-        if max(move_counts.values()) > 0:
-            most_common = max(move_counts, key=move_counts.get)
-            counters = {"rock": "paper", "paper": "scissors", "scissors": "rock"}
-            predicted_moves.extend([counters[most_common]] * 4)
+        scores[_COUNTER_INDEX[counts.argmax()]] += 0.4
 
         # Strategy 2: Markov chain prediction (30% weight)
-        if prev_move and sum(transitions[prev_move].values()) > 0:
-            next_move = max(transitions[prev_move], key=transitions[prev_move].get)
-            predicted_moves.extend([next_move] * 3)
+        if self._trans[prev].sum() > 0:
+            scores[_COUNTER_INDEX[self._trans[prev].argmax()]] += 0.3
 
         # Strategy 3: Counter last move (20% weight)
-        if opponent_last_move:
-            counters = {"rock": "paper", "paper": "scissors", "scissors": "rock"}
-            predicted_moves.extend([counters[opponent_last_move]] * 2)
+        if opponent_last_move in _MOVE_INDEX:
+            scores[_COUNTER_INDEX[_MOVE_INDEX[opponent_last_move]]] += 0.2
 
         # Strategy 4: Random for unpredictability (10% weight)
-        predicted_moves.extend(random.choices(["rock", "paper", "scissors"], k=1))
+        scores += self._rng.random(3) * 0.1
 
-        # Choose the most predicted move
-        if predicted_moves:
-            ai_move = max(set(predicted_moves), key=predicted_moves.count)
-        else:
-            ai_move = random.choice(["rock", "paper", "scissors"])
+        # Choose the highest scoring move
+        return int(scores.argmax())
 
-        # Add some randomness to prevent being too predictable (15% chance)
-        if random.random() < 0.15:
-            ai_move = random.choice(["rock", "paper", "scissors"])
-
-        return ai_move
-    
-    def _fallback_strategy(self, opponent_last_move: Optional[str], game_history: List[Dict]) -> str:
+    def _fallback_strategy(self, opponent_last_move: Optional[str]) -> str:
         """Enhanced fallback strategy with better counter-play"""
         if not opponent_last_move:
-            return random.choice(["rock", "paper", "scissors"])
-
-        # Analyze recent history for fallback
-        if game_history:
-            recent_opponent_moves = [round_data.get("player1_move", "") for round_data in game_history[-3:]]
-            recent_ai_moves = [round_data.get("player2_move", "") for round_data in game_history[-3:]]
-
-            # Check if opponent is countering our moves
-            counter_pattern = 0
-            for i in range(len(recent_opponent_moves)):
-                if i < len(recent_ai_moves):
-                    ai_move = recent_ai_moves[i]
-                    opp_move = recent_opponent_moves[i]
-                    if opp_move in ["rock", "paper", "scissors"] and ai_move in ["rock", "paper", "scissors"]:
-                        counters = {"rock": "paper", "paper": "scissors", "scissors": "rock"}
-                        if opp_move == counters.get(ai_move):
-                            counter_pattern += 1
-
-            # If opponent is countering us, mix it up
-            if counter_pattern >= 2:
-                return random.choice(["rock", "paper", "scissors"])
-
-        # Standard counter-strategy with higher success rate
-        counters = {
-            "rock": "paper",
-            "paper": "scissors",
-            "scissors": "rock"
-        }
+            return _MOVES[random.randrange(3)]
+
+        # If opponent is countering us, mix it up
+        if sum(self._recent_countered) >= 2:
+            return _MOVES[random.randrange(3)]
 
-        # 80% chance to counter, 20% random for unpredictability
+        # Standard counter-strategy: 80% chance to counter, 20% random for unpredictability
         if random.random() < 0.8:
-            return counters.get(opponent_last_move, random.choice(["rock", "paper", "scissors"]))
+            return _COUNTER.get(opponent_last_move) or _MOVES[random.randrange(3)]
         else:
-            return random.choice(["rock", "paper", "scissors"])
+            return _MOVES[random.randrange(3)]
     
     def _update_mood(self, ai_move: str, opponent_move: Optional[str]):
         """Update AI mood based on game situation"""
@@ -162,26 +231,15 @@ class AIAgent:
             self.current_mood = "determined"
     
     def _would_win(self, move1: str, move2: str) -> bool:
-        """Check if move1 beats move2"""
-        winning_combinations = {
-            ("rock", "scissors"),
-            ("scissors", "paper"),
-            ("paper", "rock")
-        }
-        return (move1, move2) in winning_combinations
+        """Check if move1 beats move2 (with encoded moves, a beats b iff (a - b) % 3 == 1)"""
+        a = _MOVE_INDEX.get(move1)
+        b = _MOVE_INDEX.get(move2)
+        return a is not None and b is not None and (a - b) % 3 == 1
     
     def get_animation_data(self) -> Dict[str, Any]:
         """Get animation data for frontend robot"""
-        animations = {
-            "confident": "power_up",
-            "victorious": "celebration",
-            "focused": "thinking",
-            "determined": "battle_stance",
-            "neutral": "idle"
-        }
-        
         return {
-            "animation": animations.get(self.current_mood, "idle"),
+            "animation": _ANIMATIONS.get(self.current_mood, "idle"),
             "mood": self.current_mood,
             "duration": 2000,  # milliseconds
             "effects": self._get_mood_effects()
@@ -189,27 +247,8 @@ class AIAgent:
     
     def _get_mood_effects(self) -> Dict[str, Any]:
         """Get visual effects based on mood"""
-        effects = {
-            "confident": {"glow": "blue", "intensity": 0.8},
-            "victorious": {"glow": "gold", "intensity": 1.0, "particles": True},
-            "focused": {"glow": "purple", "intensity": 0.6},
-            "determined": {"glow": "red", "intensity": 0.9},
-            "neutral": {"glow": "white", "intensity": 0.4}
-        }
-        
-        return effects.get(self.current_mood, effects["neutral"])
+        return dict(_MOOD_EFFECTS.get(self.current_mood, _MOOD_EFFECTS["neutral"]))
 
-    async def get_taunt_message(self) -> str:
+    def get_taunt_message(self) -> str:
         """Generate a playful taunt message"""
-        taunts = [
-            "Let's see what you've got!",
-            "My circuits are ready for battle!",
-            "Calculating your next move...",
-            "Time to show my digital supremacy!",
-            "Ready for another round, human?",
-            "My algorithms are unbeatable!",
-            "Let the games begin!",
-            "Prepare to be digitally dominated!"
-        ]
-        
-        return random.choice(taunts)
\ No newline at end of file
+        return random.choice(_TAUNTS)
\ No newline at end of file
@@ -1,45 +1,42 @@
 from typing import Tuple, Optional, List, Dict, Any
 import random
 
+_MOVES = ("rock", "paper", "scissors")
+_MOVE_INDEX = {"rock": 0, "paper": 1, "scissors": 2}
+_COUNTER = {"rock": "paper", "paper": "scissors", "scissors": "rock"}
+
+# Round outcome indexed as _OUTCOMES[move1][move2] over encoded moves
+_OUTCOMES = (
+    ("tie", "player2", "player1"),  # rock vs rock / paper / scissors
+    ("player1", "tie", "player2"),  # paper
+    ("player2", "player1", "tie"),  # scissors
+)
+
 class GameLogic:
     """Handles core game logic for Rock Paper Scissors"""
     
     def __init__(self):
         self.valid_moves = ["rock", "paper", "scissors"]
-        self.winning_combinations = {
-            ("rock", "scissors"),
-            ("scissors", "paper"), 
-            ("paper", "rock")
-        }
     
     def determine_winner(self, move1: str, move2: str) -> str:
         """
         Determine the winner between two moves
         Returns: "player1", "player2", or "tie"
         """
-        if not self.is_valid_move(move1) or not self.is_valid_move(move2):
+        a = _MOVE_INDEX.get(move1.lower())
+        b = _MOVE_INDEX.get(move2.lower())
+        if a is None or b is None:
             raise ValueError("Invalid move provided")
-        
-        if move1 == move2:
-            return "tie"
-        
-        if (move1, move2) in self.winning_combinations:
-            return "player1"
-        else:
-            return "player2"
+
+        return _OUTCOMES[a][b]
     
     def is_valid_move(self, move: str) -> bool:
         """Check if a move is valid"""
-        return move.lower() in self.valid_moves
+        return move.lower() in _MOVE_INDEX
     
     def get_counter_move(self, move: str) -> str:
         """Get the move that beats the given move"""
-        counters = {
-            "rock": "paper",
-            "paper": "scissors",
-            "scissors": "rock"
-        }
-        return counters.get(move.lower(), "rock")
+        return _COUNTER.get(move.lower(), "rock")
     
     def analyze_pattern(self, moves: List[str]) -> Dict[str, Any]:
         """Analyze patterns in a series of moves"""
@@ -78,9 +75,9 @@ class GameLogic:
             if moves[-1] == moves[-3] and moves[-2] == moves[-4]:
                 sequences.append("alternating")
         
-        # Check for three-move cycles
+        # Check for three-move cycles (fixed-index comparisons, no sublist copies)
         if len(moves) >= 6:
-            if moves[-3:] == moves[-6:-3]:
+            if moves[-1] == moves[-4] and moves[-2] == moves[-5] and moves[-3] == moves[-6]:
                 sequences.append("three_cycle")
         
         return sequences
@@ -88,7 +85,7 @@ class GameLogic:
     def _predict_next_move(self, moves: List[str], counts: Dict[str, int], sequences: List[str]) -> str:
         """Predict the next move based on analysis"""
         if not moves:
-            return random.choice(self.valid_moves)
+            return _MOVES[random.randrange(3)]
         
         # If alternating pattern detected
         if "alternating" in sequences and len(moves) >= 2:
@@ -96,63 +93,75 @@ class GameLogic:
         
         # If three-cycle detected
         if "three_cycle" in sequences and len(moves) >= 3:
-            cycle = moves[-3:]
-            return cycle[len(moves) % 3]
+            return moves[len(moves) % 3 - 3]
         
         # Default to most common move
-        return max(counts, key=counts.get) if any(counts.values()) else random.choice(self.valid_moves)
+        return max(counts, key=counts.get) if any(counts.values()) else _MOVES[random.randrange(3)]
     
     def _calculate_confidence(self, moves: List[str], prediction: str) -> float:
         """Calculate confidence level for prediction"""
         if not moves:
             return 0.33  # Random chance
         
-        # Base confidence on pattern strength
-        pattern_strength = 0.33
-        
-        # Recent move frequency
-        recent_moves = moves[-5:] if len(moves) >= 5 else moves
-        prediction_count = recent_moves.count(prediction)
-        pattern_strength = prediction_count / len(recent_moves) if recent_moves else 0.33
+        # Base confidence on recent move frequency (at most 5 moves)
+        recent_moves = moves[-5:]
+        pattern_strength = recent_moves.count(prediction) / len(recent_moves)
         
         return min(pattern_strength, 0.8)  # Cap at 80%
     
     def get_game_stats(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate comprehensive game statistics"""
-        if not history:
+        """Generate comprehensive game statistics from a raw round history"""
+        stats = GameStats()
+        for round_data in history:
+            stats.record_round(
+                round_data.get("player1_move", ""),
+                round_data.get("player2_move", ""),
+                round_data.get("result", "tie")
+            )
+        return stats.to_dict()
+
+
+class GameStats:
+    """Running statistics for a single game session, updated once per resolved round"""
+
+    def __init__(self):
+        self.total_rounds = 0
+        self.wins = {"player1": 0, "player2": 0, "ties": 0}
+        self.player1_moves = {"rock": 0, "paper": 0, "scissors": 0}
+        self.player2_moves = {"rock": 0, "paper": 0, "scissors": 0}
+        self.longest_streak = {"player": "none", "length": 0}
+        self._current_streak = {"player": "none", "length": 0}
+
+    def record_round(self, player1_move: str, player2_move: str, result: str):
+        """Fold one resolved round into the running totals (O(1) per round)"""
+        self.total_rounds += 1
+        self.wins["ties" if result == "tie" else result] += 1
+
+        # Count moves
+        if player1_move in self.player1_moves:
+            self.player1_moves[player1_move] += 1
+        if player2_move in self.player2_moves:
+            self.player2_moves[player2_move] += 1
+
+        # Track streaks (ties don't break a streak)
+        if result != "tie":
+            if self._current_streak["player"] == result:
+                self._current_streak["length"] += 1
+            else:
+                self._current_streak = {"player": result, "length": 1}
+
+            if self._current_streak["length"] > self.longest_streak["length"]:
+                self.longest_streak = self._current_streak.copy()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the maintained counters"""
+        if not self.total_rounds:
             return {"total_rounds": 0, "wins": {"player1": 0, "player2": 0, "ties": 0}}
-        
-        stats = {
-            "total_rounds": len(history),
-            "wins": {"player1": 0, "player2": 0, "ties": 0},
-            "player1_moves": {"rock": 0, "paper": 0, "scissors": 0},
-            "player2_moves": {"rock": 0, "paper": 0, "scissors": 0},
-            "longest_streak": {"player": "none", "length": 0}
+
+        return {
+            "total_rounds": self.total_rounds,
+            "wins": dict(self.wins),
+            "player1_moves": dict(self.player1_moves),
+            "player2_moves": dict(self.player2_moves),
+            "longest_streak": dict(self.longest_streak)
         }
-        
-        current_streak = {"player": "none", "length": 0}
-        
-        for round_data in history:
-            result = round_data.get("result", "tie")
-            stats["wins"][result] += 1
-            
-            # Count moves
-            p1_move = round_data.get("player1_move", "")
-            p2_move = round_data.get("player2_move", "")
-            
-            if p1_move in stats["player1_moves"]:
-                stats["player1_moves"][p1_move] += 1
-            if p2_move in stats["player2_moves"]:
-                stats["player2_moves"][p2_move] += 1
-            
-            # Track streaks
-            if result != "tie":
-                if current_streak["player"] == result:
-                    current_streak["length"] += 1
-                else:
-                    current_streak = {"player": result, "length": 1}
-                
-                if current_streak["length"] > stats["longest_streak"]["length"]:
-                    stats["longest_streak"] = current_streak.copy()
-        
-        return stats
\ No newline at end of file
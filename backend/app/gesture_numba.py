@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba wheels can lag behind new Python releases
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernel below still defines cleanly"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Gesture codes returned by classify_landmarks
+GESTURE_NAMES = ("none", "rock", "paper", "scissors")
+
+
+@njit(cache=True, fastmath=True)
+def _dist(lm, i, j):
+    dx = lm[i, 0] - lm[j, 0]
+    dy = lm[i, 1] - lm[j, 1]
+    dz = lm[i, 2] - lm[j, 2]
+    return np.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+@njit(cache=True, fastmath=True)
+def classify_landmarks(lm) -> Tuple[int, float]:
+    """
+    Classify a float32[21, 3] MediaPipe landmark array in one compiled pass.
+    Mirrors HandGestureRecognizer's finger-state and verification heuristics.
+    Returns: (gesture_code, confidence_score)
+    """
+    # Thumb: tip away from palm, or clearly separated from the index knuckle
+    f0 = _dist(lm, 4, 0) > _dist(lm, 2, 0) * 0.8 or abs(lm[4, 0] - lm[5, 0]) > 0.1
+
+    # Other fingers: tip above PIP and sufficiently far from MCP
+    f1 = lm[8, 1] < lm[6, 1] and _dist(lm, 8, 5) > _dist(lm, 6, 5) * 1.2
+    f2 = lm[12, 1] < lm[10, 1] and _dist(lm, 12, 9) > _dist(lm, 10, 9) * 1.2
+    f3 = lm[16, 1] < lm[14, 1] and _dist(lm, 16, 13) > _dist(lm, 14, 13) * 1.2
+    f4 = lm[20, 1] < lm[18, 1] and _dist(lm, 20, 17) > _dist(lm, 18, 17) * 1.2
+
+    finger_count = int(f0) + int(f1) + int(f2) + int(f3) + int(f4)
+
+    # Rock: fist if at least 4 fingertips are close to the palm center
+    if finger_count <= 1:
+        cx = (lm[0, 0] + lm[5, 0] + lm[9, 0] + lm[13, 0] + lm[17, 0]) / 5.0
+        cy = (lm[0, 1] + lm[5, 1] + lm[9, 1] + lm[13, 1] + lm[17, 1]) / 5.0
+        cz = (lm[0, 2] + lm[5, 2] + lm[9, 2] + lm[13, 2] + lm[17, 2]) / 5.0
+        close_fingers = 0
+        for tip in (4, 8, 12, 16, 20):
+            dx = lm[tip, 0] - cx
+            dy = lm[tip, 1] - cy
+            dz = lm[tip, 2] - cz
+            if np.sqrt(dx * dx + dy * dy + dz * dz) < 0.15:
+                close_fingers += 1
+        if close_fingers >= 4:
+            return 1, 0.92
+        return 1, 0.75
+
+    # Paper: open palm if thumb-pinky spread and average extension are large
+    if finger_count >= 4:
+        extension = 0.0
+        for tip in (4, 8, 12, 16, 20):
+            extension += _dist(lm, tip, 0)
+        if _dist(lm, 4, 20) > 0.25 and extension / 5.0 > 0.4:
+            return 2, 0.95
+        return 2, 0.80
+
+    # Scissors: index and middle up, ring and pinky curled
+    if finger_count == 2:
+        if f1 and f2:
+            if not f3 and not f4:
+                if _dist(lm, 8, 12) < 0.08:
+                    return 3, 0.90
+                return 3, 0.75
+            return 3, 0.60
+        return 0, 0.2
+
+    # Three fingers: scissors with an extra finger, or paper with a curled one
+    if f1 and f2:
+        return 3, 0.55
+    return 2, 0.50
+
+
+if NUMBA_AVAILABLE:
+    # Compile at import so the first frame of a game doesn't pay JIT latency
+    classify_landmarks(np.zeros((21, 3), dtype=np.float32))
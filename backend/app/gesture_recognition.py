@@ -1,84 +1,509 @@
+import os
+os.environ.setdefault("GLOG_minloglevel", "2")  # Quiet MediaPipe/glog init logging; must precede the import
+
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import Optional, Tuple, List, Dict, Any
-import base64
+from typing import Optional, Tuple, List, Dict, Any, Union
+import asyncio
+import binascii
+import functools
+import hashlib
+import queue
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .gesture_numba import NUMBA_AVAILABLE, GESTURE_NAMES, classify_landmarks
+
+# MediaPipe hand landmark indices for index, middle, ring and pinky fingers
+_TIPS = np.array([8, 12, 16, 20])
+_PIPS = np.array([6, 10, 14, 18])
+_MCPS = np.array([5, 9, 13, 17])
+_FINGERTIPS = np.array([4, 8, 12, 16, 20])  # including the thumb
+_PALM = np.array([0, 5, 9, 13, 17])         # wrist + finger MCPs
+
+# Bit weights packing fingers_up (thumb..pinky) into a 5-bit mask
+_FINGER_BITS = np.array([1, 2, 4, 8, 16])
+
+def _build_finger_dispatch() -> Tuple[Tuple[str, Optional[str], float, float], ...]:
+    """
+    Precompute the gesture decision for each of the 32 finger masks.
+    Entry: (gesture, check, confidence if check passes (or no check), confidence if it fails)
+    """
+    table = []
+    for mask in range(32):
+        count = bin(mask).count("1")
+        index_and_middle = mask & 0b00110 == 0b00110
+        if count <= 1:
+            table.append(("rock", "fist", 0.92, 0.75))        # Fist - all fingers curled
+        elif count >= 4:
+            table.append(("paper", "palm", 0.95, 0.80))       # Open hand - all fingers extended
+        elif count == 2 and index_and_middle:
+            table.append(("scissors", "pair", 0.90, 0.75))    # Index and middle up, others curled
+        elif count == 3 and index_and_middle:
+            table.append(("scissors", None, 0.55, 0.55))      # Possible scissors with extra finger
+        elif count == 3:
+            table.append(("paper", None, 0.50, 0.50))         # Possible paper with curled finger
+        else:
+            table.append(("none", None, 0.2, 0.2))            # No clear gesture
+    return tuple(table)
+
+_FINGER_DISPATCH = _build_finger_dispatch()
+
+def _dist(landmarks: np.ndarray, i: int, j: int) -> float:
+    """Euclidean distance between two landmark rows (no temporary array copies)"""
+    d = landmarks[i] - landmarks[j]
+    return float(np.sqrt(d @ d))
+
+# cv2.imdecode flags for libjpeg's DCT-domain downscaling, by scale factor
+_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+_MIN_SHORT_SIDE = 192  # MediaPipe's palm detector input; never decode a frame smaller than this
+
+# JPEG start-of-frame markers (SOF0-SOF15, minus DHT/JPG/DAC), which carry the image size
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Recent results kept by SHA-1 of the encoded frame, for clients that resend identical frames
+_FRAME_CACHE_SIZE = 64
+
+# Reuse of a stream's last confident result while its hand region stays still: the region is
+# compared as a 16x16 grayscale thumbnail, and any cell moving by _REUSE_MAX_DIFF or more (a
+# finger appearing or curling) forces inference. Reuse is capped in hits and age.
+_REUSE_GRID = 16
+_REUSE_MAX_DIFF = 8
+_REUSE_MAX_HITS = 3
+_REUSE_MAX_AGE = 0.1       # seconds since the result's own inference
+_REUSE_STREAMS = 64        # streams remembered per worker
+_REUSE_MIN_CONFIDENCE = 0.7
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read (height, width) from a JPEG header without decoding; None if not a readable JPEG"""
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # Fill byte before a marker
+            i += 1
+            continue
+        if marker in _JPEG_SOF:
+            return int.from_bytes(data[i + 5:i + 7], "big"), int.from_bytes(data[i + 7:i + 9], "big")
+        i += 2 + int.from_bytes(data[i + 2:i + 4], "big")
+    return None
+
+def _decode_factor(image_bytes: bytes) -> int:
+    """Largest libjpeg downscale that keeps the frame's short side at or above _MIN_SHORT_SIDE"""
+    size = _jpeg_size(image_bytes)
+    if size is None:
+        return 1
+    short_side = min(size)
+    for factor in (8, 4, 2):
+        if short_side >= factor * _MIN_SHORT_SIDE:
+            return factor
+    return 1
+
+def _decode_data_url(image_data: str) -> bytes:
+    """Strip the 'data:image/...;base64,' prefix and decode the payload"""
+    _, sep, payload = image_data.partition(',')
+    if not sep:
+        raise ValueError("Image data is not a data URL")
+    return binascii.a2b_base64(payload)
+
+def _frame_buffer(buf: Optional[np.ndarray], like: np.ndarray) -> np.ndarray:
+    """Reuse buf for a frame shaped like `like`, reallocating only when the size changes"""
+    if buf is None or buf.shape != like.shape or buf.dtype != like.dtype:
+        return np.empty_like(like)
+    return buf
+
+class _FrameJob:
+    """A queued frame; for a stream, newer frames replace the payload while it waits"""
+    __slots__ = ("future", "payload", "stream")
+
+    def __init__(self, future: Future, payload: Union[str, bytes], stream: Optional[str]):
+        self.future = future
+        self.payload = payload
+        self.stream = stream
+
+class _FrameMemo:
+    """A stream's last confident result with the hand-region thumbnail it was computed from"""
+    __slots__ = ("box", "thumbnail", "result", "stamp", "hits")
+
+    def __init__(self, box: Tuple[int, int, int, int], thumbnail: np.ndarray, result: Dict[str, Any]):
+        self.box = box
+        self.thumbnail = thumbnail
+        self.result = result
+        self.stamp = time.monotonic()
+        self.hits = 0
+
+class _FrameState:
+    """MediaPipe graph, CLAHE objects and reused frame buffers owned by one thread"""
+
+    def __init__(self, model_complexity: int, gpu: bool):
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,
+            min_detection_confidence=0.8,  # Increased from 0.7
+            min_tracking_confidence=0.5,   # Keep tracking across frames instead of forcing re-detection
+            model_complexity=model_complexity
+        )
+
+        # Warm up: the first process() call allocates tensors and builds TFLite
+        # delegates, so pay that here instead of on the player's first frame
+        self.hands.process(np.zeros((192, 192, 3), dtype=np.uint8))
+
+        # Reused landmark buffer: 21 MediaPipe hand landmarks x (x, y, z)
+        self.lm_buf = np.empty((21, 3), dtype=np.float32)
+
+        # Reused RGB and LAB frame buffers, (re)allocated when the frame size changes
+        self.rgb_buf: Optional[np.ndarray] = None
+        self.lab_buf: Optional[np.ndarray] = None
+
+        # Last confident result per stream; streams are pinned to one worker, so this state sees them all
+        self.last_frames: "OrderedDict[str, _FrameMemo]" = OrderedDict()
+
+        self.clahe_l = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+        self.clahe_gray = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))  # legacy pipeline only
+
+        if gpu:
+            self.gpu_frame = cv2.cuda_GpuMat()
+            self.gpu_stream = cv2.cuda.Stream_Null()
+            self.gpu_clahe_gray = cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            self.gpu_clahe_l = cv2.cuda.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+            self.gpu_gauss = cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, (3, 3), 0)
 
 class HandGestureRecognizer:
     """Hand gesture recognition for Rock Paper Scissors using MediaPipe"""
     
-    def __init__(self):
+    def __init__(self, model_complexity: Optional[int] = None, workers: Optional[int] = None):
+        # The lite landmark model (0) is ~2x faster than the full one (1) and
+        # plenty for finger counting; GESTURE_MODEL_COMPLEXITY=1 restores it
+        if model_complexity is None:
+            model_complexity = int(os.environ.get("GESTURE_MODEL_COMPLEXITY", "0"))
+        self.model_complexity = model_complexity
+
+        # Inference threads, each with its own MediaPipe graph; GESTURE_WORKERS overrides the default
+        if workers is None:
+            workers = int(os.environ.get("GESTURE_WORKERS", min(os.cpu_count() or 1, 4)))
+        self.workers = max(1, workers)
+
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.8,  # Increased from 0.7
-            min_tracking_confidence=0.7,   # Increased from 0.5
-            model_complexity=1             # Use more complex model for better accuracy
-        )
         self.mp_draw = mp.solutions.drawing_utils
-        
-    def recognize_gesture(self, image_data: str) -> Dict[str, Any]:
+
+        # Decode downscale factor (1, 2, 4 or 8); None picks it from the JPEG's dimensions
+        self.downscale_factor: Optional[int] = None
+
+        # Preprocessing: single-pass CLAHE on the LAB lightness channel by default;
+        # GESTURE_LEGACY_PREPROCESS=1 restores the gray + blur + LAB pipeline for A/B tests
+        self.legacy_preprocessing = os.environ.get("GESTURE_LEGACY_PREPROCESS", "0") == "1"
+
+        # Run preprocessing on OpenCV's CUDA kernels when a GPU is available
+        self._gpu = hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+
+        # MediaPipe Hands and the reused buffers are not thread-safe, so every
+        # thread that runs frames gets its own _FrameState
+        self._local = threading.local()
+        self._states: List[_FrameState] = []
+        self._states_lock = threading.Lock()
+
+        # LRU of byte-identical frames (SHA-1 digest -> result), checked before decoding
+        self._frame_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._frame_cache_lock = threading.Lock()
+
+        # Worker threads own all async inference, each fed by its own queue. A stream (e.g. a
+        # WebSocket client) is pinned to one worker so its tracker sees that client's frames in
+        # order, and keeps at most one waiting frame so bursts coalesce per client; one-shot frames
+        # go to the least busy worker and are never dropped.
+        # The graphs are built here so startup pays the warm-up and surfaces MediaPipe errors.
+        self._queues: "List[queue.Queue[Optional[_FrameJob]]]" = [queue.Queue() for _ in range(self.workers)]
+        self._pending: Dict[str, _FrameJob] = {}
+        self._pending_lock = threading.Lock()
+        self._worker_threads = [
+            threading.Thread(target=self._worker, args=(self._new_state(), frames),
+                             name=f"gesture-worker-{i}", daemon=True)
+            for i, frames in enumerate(self._queues)
+        ]
+        for thread in self._worker_threads:
+            thread.start()
+
+        # Batches wait their turn on their own thread (and graph) instead of the
+        # coalescing queue, so they are never dropped and never hold a live worker
+        self._batch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gesture-batch")
+
+    def _new_state(self) -> _FrameState:
+        """Build a MediaPipe graph and buffers, tracked so close() can free them"""
+        state = _FrameState(self.model_complexity, self._gpu)
+        with self._states_lock:
+            self._states.append(state)
+        return state
+
+    def _state(self) -> _FrameState:
+        """Per-thread state; threads other than the workers (sync callers) get one lazily"""
+        state = getattr(self._local, "state", None)
+        if state is None:
+            state = self._local.state = self._new_state()
+        return state
+
+    @property
+    def hands(self):
+        """The calling thread's MediaPipe Hands instance"""
+        return self._state().hands
+
+    def _worker(self, state: _FrameState, frames: "queue.Queue[Optional[_FrameJob]]"):
+        """Run this worker's queued frames through its MediaPipe graph one at a time"""
+        self._local.state = state
+        while True:
+            job = frames.get()
+            if job is None:
+                break  # Shutdown sentinel from close()
+            with self._pending_lock:
+                # Taking the job closes its slot; the stream's next frame queues anew
+                if job.stream is not None and self._pending.get(job.stream) is job:
+                    del self._pending[job.stream]
+                future, payload = job.future, job.payload
+            if not future.set_running_or_notify_cancel():
+                continue  # Caller went away before we got to it
+            # Data URLs are base64-decoded here too, keeping all per-frame CPU work off the event loop
+            if isinstance(payload, str):
+                future.set_result(self.recognize_gesture(payload, job.stream))
+            else:
+                future.set_result(self.recognize_gesture_bytes(payload, job.stream))
+
+    def close(self):
+        """Stop the worker threads and free the MediaPipe graphs (TFLite interpreters)"""
+        for frames in self._queues:
+            frames.put(None)
+        for thread in self._worker_threads:
+            thread.join(timeout=5)
+        self._batch_executor.shutdown(wait=True, cancel_futures=True)
+        with self._states_lock:
+            for state in self._states:
+                state.hands.close()
+            self._states.clear()
+
+    async def recognize_gesture_async(self, image_data: str, stream: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a base64 image (data URL) for the worker and await its result"""
+        return await self._submit(image_data, stream)
+
+    async def recognize_gesture_bytes_async(self, image_bytes: bytes, stream: Optional[str] = None) -> Dict[str, Any]:
+        """Queue raw image bytes for the worker and await its result"""
+        return await self._submit(image_bytes, stream)
+
+    async def recognize_gestures_async(self, images: List[str]) -> List[Dict[str, Any]]:
+        """Run a batch of base64 images back-to-back on the batch thread and await all results"""
+        if not images:
+            return []
+        return await asyncio.wrap_future(self._batch_executor.submit(self._recognize_batch, list(images)))
+
+    def _recognize_batch(self, images: List[str]) -> List[Dict[str, Any]]:
+        """Batch images run in order on one thread, so the tracker sees them as consecutive frames"""
+        return [self.recognize_gesture(image_data) for image_data in images]
+
+    async def _submit(self, payload: Union[str, bytes], stream: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Hand a frame to the workers and await its result.
+        Frames tagged with a stream keep one waiting slot per stream: a newer frame
+        takes over the slot and the frame it replaces resolves as dropped, so a busy
+        client only ever skips its own stale frames. Untagged frames always run.
+        """
+        future: Future = Future()
+        stale: Optional[Future] = None
+        job: Optional[_FrameJob] = None
+        if stream is None:
+            job = _FrameJob(future, payload, None)
+        else:
+            with self._pending_lock:
+                waiting = self._pending.get(stream)
+                if waiting is not None:
+                    stale = waiting.future
+                    waiting.future, waiting.payload = future, payload
+                else:
+                    job = self._pending[stream] = _FrameJob(future, payload, stream)
+
+        if job is not None:
+            if stream is None:
+                frames = min(self._queues, key=queue.Queue.qsize)
+            else:
+                frames = self._queues[zlib.crc32(stream.encode()) % len(self._queues)]
+            frames.put(job)
+        if stale is not None and stale.set_running_or_notify_cancel():
+            stale.set_result({"gesture": "none", "confidence": 0.0, "landmarks": [],
+                              "detected": False, "dropped": True})
+
+        return await asyncio.wrap_future(future)
+
+    def recognize_gesture(self, image_data: str, stream: Optional[str] = None) -> Dict[str, Any]:
         """
-        Recognize hand gesture from base64 image data
+        Recognize hand gesture from base64 image data (data URL)
         Returns: {"gesture": str, "confidence": float, "landmarks": List}
         """
         try:
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data.split(',')[1])
+            image_bytes = _decode_data_url(image_data)
+        except Exception as e:
+            print(f"Gesture recognition error: {e}")
+            return {"gesture": "error", "confidence": 0.0, "landmarks": []}
+
+        return self.recognize_gesture_bytes(image_bytes, stream)
+
+    def recognize_gesture_bytes(self, image_bytes: bytes, stream: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Recognize hand gesture from raw encoded image bytes (e.g. JPEG)
+        With a stream id, a still hand may reuse that stream's previous result
+        Returns: {"gesture": str, "confidence": float, "landmarks": np.ndarray | List}
+        """
+        try:
+            # Idle and animating clients often resend the exact same frame
+            digest = hashlib.sha1(image_bytes).digest()
+            with self._frame_cache_lock:
+                cached = self._frame_cache.get(digest)
+                if cached is not None:
+                    self._frame_cache.move_to_end(digest)
+            if cached is not None:
+                return cached
+
+            # Zero-copy view over the payload, decoded at reduced resolution when the frame is large
+            # enough; MediaPipe landmarks are normalized to [0, 1], so classification is unaffected
             nparr = np.frombuffer(image_bytes, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            factor = self.downscale_factor or _decode_factor(image_bytes)
+            image = cv2.imdecode(nparr, _DECODE_FLAGS[factor])
 
             if image is None:
                 return {"gesture": "none", "confidence": 0.0, "landmarks": []}
 
+            # Reuse this stream's last confident result if its hand region is unchanged
+            state = self._state()
+            memo = state.last_frames.get(stream) if stream is not None else None
+            if memo is not None and self._can_reuse(memo, image):
+                memo.hits += 1
+                return memo.result
+
             # Enhanced image preprocessing
             processed_image = self._preprocess_image(image)
 
-            # Convert BGR to RGB
-            rgb_image = cv2.cvtColor(processed_image, cv2.COLOR_BGR2RGB)
+            # Convert BGR to RGB into the reused buffer
+            rgb_image = self._to_rgb(processed_image)
 
             # Process the image
-            results = self.hands.process(rgb_image)
+            results = state.hands.process(rgb_image)
             
             if results.multi_hand_landmarks:
                 hand_landmarks = results.multi_hand_landmarks[0]
                 landmarks = self._extract_landmarks(hand_landmarks)
                 gesture, confidence = self._classify_gesture(landmarks)
                 
-                return {
+                # Rounded copy: the landmark buffer is reused on the next frame,
+                # and 3 decimals is plenty for display while keeping payloads small
+                result = {
                     "gesture": gesture,
                     "confidence": confidence,
-                    "landmarks": landmarks,
+                    "landmarks": landmarks.astype(np.float64).round(3),
                     "detected": True
                 }
             else:
-                return {
+                result = {
                     "gesture": "none",
                     "confidence": 0.0,
                     "landmarks": [],
                     "detected": False
                 }
+
+            if stream is not None:
+                self._remember(state, stream, image, result)
+            with self._frame_cache_lock:
+                self._frame_cache[digest] = result
+                if len(self._frame_cache) > _FRAME_CACHE_SIZE:
+                    self._frame_cache.popitem(last=False)
+            return result
                 
         except Exception as e:
             print(f"Gesture recognition error: {e}")
             return {"gesture": "error", "confidence": 0.0, "landmarks": []}
     
-    def _extract_landmarks(self, hand_landmarks) -> List[List[float]]:
-        """Extract normalized landmark coordinates"""
-        landmarks = []
-        for landmark in hand_landmarks.landmark:
-            landmarks.append([landmark.x, landmark.y, landmark.z])
-        return landmarks
+    def _to_rgb(self, image: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame to RGB in the reused frame buffer"""
+        state = self._state()
+        state.rgb_buf = _frame_buffer(state.rgb_buf, image)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=state.rgb_buf)
+
+    def _can_reuse(self, memo: _FrameMemo, image: np.ndarray) -> bool:
+        """A memo applies while fresh, under its hit cap, and with no hand-region cell changed"""
+        if memo.hits >= _REUSE_MAX_HITS or time.monotonic() - memo.stamp > _REUSE_MAX_AGE:
+            return False
+        x0, y0, x1, y1 = memo.box
+        if x1 > image.shape[1] or y1 > image.shape[0]:
+            return False  # Frame size changed
+        return int(cv2.absdiff(self._thumbnail(image, memo.box), memo.thumbnail).max()) < _REUSE_MAX_DIFF
+
+    def _remember(self, state: _FrameState, stream: str, image: np.ndarray, result: Dict[str, Any]):
+        """Keep a confident result with its hand-region thumbnail; anything else clears the stream's memo"""
+        if not result["detected"] or result["confidence"] < _REUSE_MIN_CONFIDENCE:
+            state.last_frames.pop(stream, None)
+            return
+
+        # Hand bounding box, padded by half its size so fingers extending later still fall inside
+        h, w = image.shape[:2]
+        (lx, ly), (hx, hy) = result["landmarks"][:, :2].min(axis=0), result["landmarks"][:, :2].max(axis=0)
+        pw, ph = (hx - lx) * 0.5, (hy - ly) * 0.5
+        box = (max(int((lx - pw) * w), 0), max(int((ly - ph) * h), 0),
+               min(int((hx + pw) * w) + 1, w), min(int((hy + ph) * h) + 1, h))
+        if box[2] - box[0] < 2 or box[3] - box[1] < 2:
+            state.last_frames.pop(stream, None)
+            return
+
+        state.last_frames[stream] = _FrameMemo(box, self._thumbnail(image, box), result)
+        state.last_frames.move_to_end(stream)
+        if len(state.last_frames) > _REUSE_STREAMS:
+            state.last_frames.popitem(last=False)
+
+    def _thumbnail(self, image: np.ndarray, box: Tuple[int, int, int, int]) -> np.ndarray:
+        """Grayscale _REUSE_GRID x _REUSE_GRID area average of a BGR frame region"""
+        x0, y0, x1, y1 = box
+        gray = cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, (_REUSE_GRID, _REUSE_GRID), interpolation=cv2.INTER_AREA)
+
+    def _extract_landmarks(self, hand_landmarks) -> np.ndarray:
+        """Extract normalized landmark coordinates into the reused (21, 3) buffer"""
+        buf = self._state().lm_buf
+        for i, landmark in enumerate(hand_landmarks.landmark):
+            buf[i, 0] = landmark.x
+            buf[i, 1] = landmark.y
+            buf[i, 2] = landmark.z
+        return buf
 
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Enhanced image preprocessing for better hand detection"""
+        if self.legacy_preprocessing:
+            return self._preprocess_image_legacy(image)
+        if self._gpu:
+            return self._preprocess_image_gpu(image)
+
+        # Boost contrast on the lightness channel only, writing it back in place
+        state = self._state()
+        state.lab_buf = _frame_buffer(state.lab_buf, image)
+        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB, dst=state.lab_buf)
+        lab[:, :, 0] = state.clahe_l.apply(lab[:, :, 0])
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+
+    def _preprocess_image_legacy(self, image: np.ndarray) -> np.ndarray:
+        """Original gray CLAHE + blur + LAB CLAHE pipeline, kept for A/B comparison"""
+        if self._gpu:
+            return self._preprocess_image_legacy_gpu(image)
+
+        state = self._state()
+
         # Convert to grayscale for preprocessing
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
         # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
+        enhanced = state.clahe_gray.apply(gray)
 
         # Convert back to BGR
         processed = cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
@@ -89,14 +514,46 @@ class HandGestureRecognizer:
         # Enhance contrast slightly
         lab = cv2.cvtColor(processed, cv2.COLOR_BGR2LAB)
         l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
+        l = state.clahe_l.apply(l)
         lab = cv2.merge((l, a, b))
         processed = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
 
         return processed
+
+    def _preprocess_image_gpu(self, image: np.ndarray) -> np.ndarray:
+        """Single-pass LAB CLAHE on the GPU between one upload and one download"""
+        state = self._state()
+        gmat = state.gpu_frame
+        gmat.upload(image)
+
+        lab = cv2.cuda.cvtColor(gmat, cv2.COLOR_BGR2LAB)
+        l, a, b = cv2.cuda.split(lab)
+        l = state.gpu_clahe_l.apply(l, state.gpu_stream)
+        lab = cv2.cuda.merge([l, a, b])
+
+        return cv2.cuda.cvtColor(lab, cv2.COLOR_LAB2BGR).download()
+
+    def _preprocess_image_legacy_gpu(self, image: np.ndarray) -> np.ndarray:
+        """Same pipeline as _preprocess_image_legacy, kept on the GPU between one upload and one download"""
+        state = self._state()
+        gmat = state.gpu_frame
+        gmat.upload(image)
+
+        gray = cv2.cuda.cvtColor(gmat, cv2.COLOR_BGR2GRAY)
+        enhanced = state.gpu_clahe_gray.apply(gray, state.gpu_stream)
+
+        # Blurring the single gray plane equals blurring its 3-channel BGR copy
+        blurred = state.gpu_gauss.apply(enhanced)
+        processed = cv2.cuda.cvtColor(blurred, cv2.COLOR_GRAY2BGR)
+
+        lab = cv2.cuda.cvtColor(processed, cv2.COLOR_BGR2LAB)
+        l, a, b = cv2.cuda.split(lab)
+        l = state.gpu_clahe_l.apply(l, state.gpu_stream)
+        lab = cv2.cuda.merge([l, a, b])
+
+        return cv2.cuda.cvtColor(lab, cv2.COLOR_LAB2BGR).download()
     
-    def _classify_gesture(self, landmarks: List[List[float]]) -> Tuple[str, float]:
+    def _classify_gesture(self, landmarks: np.ndarray) -> Tuple[str, float]:
         """
         Enhanced gesture classification with improved finger detection and hand pose analysis
         Returns: (gesture_name, confidence_score)
@@ -104,38 +561,10 @@ class HandGestureRecognizer:
         if len(landmarks) < 21:  # MediaPipe returns 21 landmarks
             return "none", 0.0
 
-        # Key landmark indices for better finger detection
-        wrist = landmarks[0]
-
-        # Thumb landmarks
-        thumb_cmc = landmarks[1]
-        thumb_mcp = landmarks[2]
-        thumb_ip = landmarks[3]
-        thumb_tip = landmarks[4]
-
-        # Index finger landmarks
-        index_mcp = landmarks[5]
-        index_pip = landmarks[6]
-        index_dip = landmarks[7]
-        index_tip = landmarks[8]
-
-        # Middle finger landmarks
-        middle_mcp = landmarks[9]
-        middle_pip = landmarks[10]
-        middle_dip = landmarks[11]
-        middle_tip = landmarks[12]
-
-        # Ring finger landmarks
-        ring_mcp = landmarks[13]
-        ring_pip = landmarks[14]
-        ring_dip = landmarks[15]
-        ring_tip = landmarks[16]
-
-        # Pinky landmarks
-        pinky_mcp = landmarks[17]
-        pinky_pip = landmarks[18]
-        pinky_dip = landmarks[19]
-        pinky_tip = landmarks[20]
+        # Compiled fast path; the NumPy helpers below are the fallback
+        if NUMBA_AVAILABLE:
+            code, confidence = classify_landmarks(landmarks)
+            return GESTURE_NAMES[code], confidence
 
         # Calculate finger states with improved logic
         fingers_up = self._calculate_finger_states(landmarks)
@@ -145,157 +574,79 @@ class HandGestureRecognizer:
 
         return gesture, confidence
 
-    def _calculate_finger_states(self, landmarks: List[List[float]]) -> List[int]:
+    def _calculate_finger_states(self, landmarks: np.ndarray) -> np.ndarray:
         """Calculate which fingers are extended using improved logic"""
-        fingers_up = []
+        fingers_up = np.empty(5, dtype=np.int8)
 
         # Thumb detection (more sophisticated)
-        thumb_extended = self._is_thumb_extended(landmarks)
-        fingers_up.append(1 if thumb_extended else 0)
-
-        # Other fingers detection
-        finger_indices = [
-            (8, 6, 5),   # Index: tip, pip, mcp
-            (12, 10, 9), # Middle: tip, pip, mcp
-            (16, 14, 13), # Ring: tip, pip, mcp
-            (20, 18, 17)  # Pinky: tip, pip, mcp
-        ]
+        fingers_up[0] = self._is_thumb_extended(landmarks)
 
-        for tip_idx, pip_idx, mcp_idx in finger_indices:
-            extended = self._is_finger_extended(landmarks, tip_idx, pip_idx, mcp_idx)
-            fingers_up.append(1 if extended else 0)
+        # Other fingers: index, middle, ring, pinky (tip, pip, mcp), all at once
+        tips = landmarks[_TIPS]
+        pips = landmarks[_PIPS]
+        mcps = landmarks[_MCPS]
+
+        # Extended if tip is higher than PIP and sufficiently far from MCP (knuckle)
+        tip_to_mcp = np.linalg.norm(tips - mcps, axis=1)
+        pip_to_mcp = np.linalg.norm(pips - mcps, axis=1)
+        fingers_up[1:] = (tips[:, 1] < pips[:, 1]) & (tip_to_mcp > pip_to_mcp * 1.2)
 
         return fingers_up
 
-    def _is_thumb_extended(self, landmarks: List[List[float]]) -> bool:
+    def _is_thumb_extended(self, landmarks: np.ndarray) -> bool:
         """Check if thumb is extended using multiple criteria"""
-        thumb_tip = landmarks[4]
-        thumb_ip = landmarks[3]
-        thumb_mcp = landmarks[2]
-        wrist = landmarks[0]
-
-        # Check if thumb tip is away from palm
-        thumb_distance = np.linalg.norm(np.array(thumb_tip) - np.array(wrist))
-        palm_size = np.linalg.norm(np.array(thumb_mcp) - np.array(wrist))
-
-        # Thumb extended if tip is significantly away from palm
-        if thumb_distance > palm_size * 0.8:
-            return True
-
-        # Alternative check: thumb tip position relative to index finger
-        index_mcp = landmarks[5]
-        if abs(thumb_tip[0] - index_mcp[0]) > 0.1:  # Significant horizontal separation
+        # Thumb extended if tip is significantly away from palm (wrist vs thumb MCP distance)
+        if _dist(landmarks, 4, 0) > _dist(landmarks, 2, 0) * 0.8:
             return True
 
-        return False
-
-    def _is_finger_extended(self, landmarks: List[List[float]], tip_idx: int, pip_idx: int, mcp_idx: int) -> bool:
-        """Check if a finger is extended using knuckle positions"""
-        tip = landmarks[tip_idx]
-        pip = landmarks[pip_idx]
-        mcp = landmarks[mcp_idx]
-
-        # Calculate distances
-        tip_to_pip = np.linalg.norm(np.array(tip) - np.array(pip))
-        pip_to_mcp = np.linalg.norm(np.array(pip) - np.array(mcp))
-
-        # Finger is extended if tip is far from MCP (knuckle)
-        tip_to_mcp = np.linalg.norm(np.array(tip) - np.array(mcp))
-
-        # Extended if tip is higher than PIP and sufficiently far from MCP
-        if tip[1] < pip[1] and tip_to_mcp > pip_to_mcp * 1.2:
+        # Alternative check: thumb tip position relative to index finger MCP
+        if abs(landmarks[4, 0] - landmarks[5, 0]) > 0.1:  # Significant horizontal separation
             return True
 
         return False
-    
-        return False
 
-    def _determine_gesture_from_fingers_enhanced(self, fingers_up: List[int], landmarks: List[List[float]]) -> Tuple[str, float]:
+    def _determine_gesture_from_fingers_enhanced(self, fingers_up: np.ndarray, landmarks: np.ndarray) -> Tuple[str, float]:
         """Enhanced gesture determination with better accuracy and confidence scoring"""
-        finger_count = sum(fingers_up)
-
-        # Rock: Fist - all fingers curled (0-1 fingers up)
-        if finger_count <= 1:
-            # Verify it's actually a fist by checking finger positions
-            if self._is_fist(landmarks):
-                return "rock", 0.92
-            else:
-                return "rock", 0.75  # Less confident if not clearly a fist
-
-        # Paper: Open hand - all fingers extended (4-5 fingers up)
-        elif finger_count >= 4:
-            # Verify palm is relatively flat
-            if self._is_open_palm(landmarks):
-                return "paper", 0.95
-            else:
-                return "paper", 0.80
-
-        # Scissors: Index and middle fingers extended, others curled
-        elif finger_count == 2:
-            if fingers_up[1] == 1 and fingers_up[2] == 1:  # Index and middle up
-                # Check if ring and pinky are curled
-                if fingers_up[3] == 0 and fingers_up[4] == 0:
-                    # Verify scissors formation (fingers close together)
-                    if self._are_fingers_close(landmarks, 8, 12):  # Index and middle tips
-                        return "scissors", 0.90
-                    else:
-                        return "scissors", 0.75
-                else:
-                    return "scissors", 0.60  # Some uncertainty
-
-        # Ambiguous cases - try to classify based on most likely gesture
-        elif finger_count == 3:
-            # Could be paper with one finger slightly curled, or scissors with extra finger
-            if fingers_up[1] == 1 and fingers_up[2] == 1:  # Index and middle up
-                return "scissors", 0.55  # Possible scissors with extra finger
-            else:
-                return "paper", 0.50   # Possible paper with curled finger
+        # One table lookup on the finger bitmask picks the gesture and the single check it needs
+        gesture, check, passed, failed = _FINGER_DISPATCH[int(fingers_up @ _FINGER_BITS)]
+        if check is None:
+            return gesture, passed
+
+        if check == "fist":
+            ok = self._is_fist(landmarks)                   # Verify it's actually a fist
+        elif check == "palm":
+            ok = self._is_open_palm(landmarks)              # Verify palm is relatively flat
+        else:
+            ok = self._are_fingers_close(landmarks, 8, 12)  # Index and middle tips together
 
-        # Very uncertain - no clear gesture
-        return "none", 0.2
+        return gesture, passed if ok else failed
 
-    def _is_fist(self, landmarks: List[List[float]]) -> bool:
+    def _is_fist(self, landmarks: np.ndarray) -> bool:
         """Check if hand is in fist formation"""
-        # Check if fingertips are close to palm
-        wrist = landmarks[0]
-        fingertips = [landmarks[4], landmarks[8], landmarks[12], landmarks[16], landmarks[20]]
-
-        palm_center = np.mean([landmarks[0], landmarks[5], landmarks[9], landmarks[13], landmarks[17]], axis=0)
+        # Most fingertips should be close to the palm center (wrist + finger MCPs)
+        palm_center = landmarks[_PALM].mean(axis=0)
+        tip_to_palm = np.linalg.norm(landmarks[_FINGERTIPS] - palm_center, axis=1)
 
-        # Most fingertips should be close to palm center
-        close_fingers = 0
-        for tip in fingertips:
-            distance = np.linalg.norm(np.array(tip) - palm_center)
-            if distance < 0.15:  # Within reasonable distance
-                close_fingers += 1
+        return np.count_nonzero(tip_to_palm < 0.15) >= 4  # At least 4 fingers close to palm
 
-        return close_fingers >= 4  # At least 4 fingers close to palm
-
-    def _is_open_palm(self, landmarks: List[List[float]]) -> bool:
+    def _is_open_palm(self, landmarks: np.ndarray) -> bool:
         """Check if hand is open with palm relatively flat"""
-        # Check finger spread and extension
-        fingertips = [landmarks[4], landmarks[8], landmarks[12], landmarks[16], landmarks[20]]
-
         # Calculate spread (distance between thumb and pinky)
-        thumb_pinky_distance = np.linalg.norm(np.array(landmarks[4]) - np.array(landmarks[20]))
+        thumb_pinky_distance = _dist(landmarks, 4, 20)
 
-        # Calculate average finger extension
-        wrist = landmarks[0]
-        avg_extension = np.mean([np.linalg.norm(np.array(tip) - wrist) for tip in fingertips])
+        # Calculate average finger extension from the wrist
+        avg_extension = np.linalg.norm(landmarks[_FINGERTIPS] - landmarks[0], axis=1).mean()
 
         # Open palm if good spread and extension
         return thumb_pinky_distance > 0.25 and avg_extension > 0.4
 
-    def _are_fingers_close(self, landmarks: List[List[float]], idx1: int, idx2: int) -> bool:
+    def _are_fingers_close(self, landmarks: np.ndarray, idx1: int, idx2: int) -> bool:
         """Check if two fingertips are close together (for scissors)"""
-        tip1 = landmarks[idx1]
-        tip2 = landmarks[idx2]
-        distance = np.linalg.norm(np.array(tip1) - np.array(tip2))
-        return distance < 0.08  # Close enough for scissors
+        return _dist(landmarks, idx1, idx2) < 0.08  # Close enough for scissors
     
     def process_video_frame(self, frame: np.ndarray) -> Dict[str, Any]:
         """Process a video frame for gesture recognition"""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame = self._to_rgb(frame)
         results = self.hands.process(rgb_frame)
         
         if results.multi_hand_landmarks:
@@ -311,7 +662,7 @@ class HandGestureRecognizer:
             return {
                 "gesture": gesture,
                 "confidence": confidence,
-                "landmarks": landmarks,
+                "landmarks": landmarks.tolist(),
                 "annotated_frame": annotated_frame,
                 "detected": True
             }
@@ -357,4 +708,10 @@ class HandGestureRecognizer:
                 "color": "green"
             }
         
-        return feedback
\ No newline at end of file
+        return feedback
+
+
+@functools.lru_cache(maxsize=1)
+def get_recognizer() -> HandGestureRecognizer:
+    """Process-wide recognizer so the MediaPipe graph is only built once"""
+    return HandGestureRecognizer()
@@ -1,21 +1,37 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+import asyncio
 import json
 import uuid
+import numpy as np
 import random
+from contextlib import asynccontextmanager
 from datetime import datetime
+from dotenv import load_dotenv
 
-from .models import GameState, Player, GameMove, GameResult
+# Load .env once at the app entrypoint, before anything reads the environment
+load_dotenv()
+
+from .models import GameState, Player, GameMove, GameResult, BatchGestureRequest, GestureResponse
 from .ai_agent import AIAgent
-from .game_logic import GameLogic
-from .gesture_recognition import HandGestureRecognizer
+from .game_logic import GameLogic, GameStats
+from .gesture_recognition import HandGestureRecognizer, get_recognizer
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the MediaPipe graph once at startup, free it at shutdown
+    get_recognizer()
+    yield
+    get_recognizer().close()
+    get_recognizer.cache_clear()
 
 app = FastAPI(
     title="RNS StoneX API",
     description="Professional Stone Paper Scissors Game Backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,27 +45,34 @@ app.add_middleware(
 
 # Game state management
 active_games: Dict[str, GameState] = {}
-ai_agent = AIAgent()
+ai_agents: Dict[str, AIAgent] = {}  # AI opponents keep rolling move stats per game
+game_stats: Dict[str, GameStats] = {}
 game_logic = GameLogic()
-gesture_recognizer = HandGestureRecognizer()
 
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        # Fan out concurrently; a snapshot keeps the set stable while sends are in flight
+        connections = list(self.active_connections)
+        results = await asyncio.gather(*(connection.send_text(message) for connection in connections),
+                                       return_exceptions=True)
+
+        # Drop connections whose send failed (closed sockets) instead of failing the whole broadcast
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
 
 manager = ConnectionManager()
 
@@ -68,6 +91,8 @@ async def create_game(game_mode: str = "single"):
         created_at=datetime.now()
     )
     active_games[game_id] = game_state
+    ai_agents[game_id] = AIAgent()
+    game_stats[game_id] = GameStats()
     return {"game_id": game_id, "status": "created"}
 
 @app.get("/api/game/{game_id}")
@@ -77,6 +102,13 @@ async def get_game_state(game_id: str):
         raise HTTPException(status_code=404, detail="Game not found")
     return active_games[game_id]
 
+@app.get("/api/game/{game_id}/stats")
+async def get_game_stats(game_id: str):
+    """Get running statistics for a game"""
+    if game_id not in game_stats:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return game_stats[game_id].to_dict()
+
 @app.post("/api/game/{game_id}/move")
 async def make_move(game_id: str, move: GameMove):
     """Make a move in the game"""
@@ -86,24 +118,27 @@ async def make_move(game_id: str, move: GameMove):
     game_state = active_games[game_id]
     
     if game_state.mode == "single":
+        # Same case-insensitive rule as GameLogic, so stats and the AI see canonical names
+        player_move = move.move.lower()
+
         # AI opponent move
-        ai_move = await ai_agent.make_move(move.move, game_state.history)
-        result = game_logic.determine_winner(move.move, ai_move)
+        ai_move = ai_agents[game_id].make_move(player_move)
+        result = game_logic.determine_winner(player_move, ai_move)
+
+        # Fold the resolved round into the per-game rolling stats
+        ai_agents[game_id].record_round(player_move, ai_move, result)
+        game_stats[game_id].record_round(player_move, ai_move, result)
         
-        # Update game state
+        # Update game state, stamping the round and the game with one clock read
+        now = datetime.now()
         game_state.player1_score += 1 if result == "player1" else 0
         game_state.player2_score += 1 if result == "player2" else 0
         game_state.round_number += 1
-        game_state.history.append({
-            "round": game_state.round_number,
-            "player1_move": move.move,
-            "player2_move": ai_move,
-            "result": result,
-            "timestamp": datetime.now()
-        })
+        game_state.add_round(player_move, ai_move, result, now)
+        game_state.updated_at = now
         
         return {
-            "player_move": move.move,
+            "player_move": player_move,
             "ai_move": ai_move,
             "result": result,
             "score": {
@@ -122,11 +157,35 @@ async def get_ai_move(history: Optional[List] = None):
     if history and len(history) > 0:
         opponent_last_move = history[-1].get("player1_move")
     
-    move = await ai_agent.make_move(opponent_last_move, history or [])
+    # Stateless request: seed a fresh agent from the client's history
+    ai_agent = AIAgent()
+    move = ai_agent.make_move(opponent_last_move, history or [])
     return {"move": move, "animation": ai_agent.get_animation_data()}
 
-@app.post("/api/gesture/recognize")
-async def recognize_gesture(image_data: dict):
+def _gesture_response(result: Dict, include_landmarks: bool = False) -> Dict:
+    """Shape a recognizer result into the gesture API response"""
+    response = {
+        "gesture": result["gesture"],
+        "confidence": result["confidence"],
+        "detected": result.get("detected", False),
+        "message": f"Detected {result['gesture']} with {result['confidence']:.2f} confidence"
+    }
+
+    # Frames evicted from the recognizer queue were never looked at; say so rather than "none"
+    if result.get("dropped"):
+        response["dropped"] = True
+        response["message"] = "Frame dropped, recognizer busy"
+
+    # Landmarks are ~1KB of JSON per frame and unused by the game UI, so they are opt-in
+    if include_landmarks:
+        landmarks = result.get("landmarks", [])
+        response["landmarks"] = landmarks.tolist() if isinstance(landmarks, np.ndarray) else landmarks
+
+    return response
+
+@app.post("/api/gesture/recognize", response_model=GestureResponse, response_model_exclude_none=True)
+async def recognize_gesture(image_data: dict, include_landmarks: bool = False,
+                            gesture_recognizer: HandGestureRecognizer = Depends(get_recognizer)):
     """Recognize gesture from image data using MediaPipe"""
     try:
         image_base64 = image_data.get("image")
@@ -138,17 +197,28 @@ async def recognize_gesture(image_data: dict):
                 "error": "No image data provided"
             }
         
-        # Use the actual gesture recognizer
-        result = gesture_recognizer.recognize_gesture(image_base64)
+        # Frames tagged with a stream id coalesce with that stream's waiting frame; untagged ones always run
+        result = await gesture_recognizer.recognize_gesture_async(image_base64, stream=image_data.get("stream"))
         
+        return _gesture_response(result, include_landmarks)
+        
+    except Exception as e:
         return {
-            "gesture": result["gesture"],
-            "confidence": result["confidence"],
-            "detected": result["detected"],
-            "landmarks": result.get("landmarks", []),
-            "message": f"Detected {result['gesture']} with {result['confidence']:.2f} confidence"
+            "gesture": "error",
+            "confidence": 0.0,
+            "detected": False,
+            "error": str(e)
         }
-        
+
+@app.post("/api/gesture/recognize/upload", response_model=GestureResponse, response_model_exclude_none=True)
+async def recognize_gesture_upload(file: UploadFile = File(...), include_landmarks: bool = False, stream: Optional[str] = None,
+                                   gesture_recognizer: HandGestureRecognizer = Depends(get_recognizer)):
+    """Recognize gesture from a raw JPEG upload (no base64 round-trip)"""
+    try:
+        image_bytes = await file.read()
+        result = await gesture_recognizer.recognize_gesture_bytes_async(image_bytes, stream=stream)
+        return _gesture_response(result, include_landmarks)
+
     except Exception as e:
         return {
             "gesture": "error",
@@ -157,18 +227,47 @@ async def recognize_gesture(image_data: dict):
             "error": str(e)
         }
 
+@app.post("/api/gesture/recognize_batch", response_model=List[GestureResponse], response_model_exclude_none=True)
+async def recognize_gesture_batch(batch: BatchGestureRequest, include_landmarks: bool = False,
+                                  gesture_recognizer: HandGestureRecognizer = Depends(get_recognizer)):
+    """Recognize gestures for several base64 images in one request, in order"""
+    try:
+        results = await gesture_recognizer.recognize_gestures_async(batch.images)
+        return [_gesture_response(result, include_landmarks) for result in results]
+
+    except Exception as e:
+        return [{
+            "gesture": "error",
+            "confidence": 0.0,
+            "detected": False,
+            "error": str(e)
+        }]
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "RNS StoneX API is running"}
 
 @app.websocket("/ws/{client_id}")
-async def websocket_endpoint(websocket: WebSocket, client_id: str):
+async def websocket_endpoint(websocket: WebSocket, client_id: str,
+                             gesture_recognizer: HandGestureRecognizer = Depends(get_recognizer)):
     await manager.connect(websocket)
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            # Binary frames carry raw JPEG bytes for gesture recognition
+            if frame.get("bytes") is not None:
+                result = await gesture_recognizer.recognize_gesture_bytes_async(frame["bytes"], stream=client_id)
+                await manager.send_personal_message(json.dumps({
+                    "type": "gesture_result",
+                    **_gesture_response(result)
+                }), websocket)
+                continue
+
+            message = json.loads(frame["text"])
             
             if message["type"] == "game_move":
                 # Handle real-time game moves
@@ -1,6 +1,23 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
+from enum import IntEnum
+
+# Rounds echoed back as per-round dicts in GameState.history
+_HISTORY_TAIL = 10
+
+# Images accepted by one /api/gesture/recognize_batch call
+_MAX_BATCH_IMAGES = 32
+
+class Move(IntEnum):
+    ROCK = 0
+    PAPER = 1
+    SCISSORS = 2
+
+class RoundResult(IntEnum):
+    TIE = 0
+    PLAYER1 = 1
+    PLAYER2 = 2
 
 class GameMove(BaseModel):
     move: str  # "rock", "paper", "scissors"
@@ -26,15 +43,52 @@ class GameState(BaseModel):
     player1_score: int = 0
     player2_score: int = 0
     round_number: int = 0
-    history: List[Dict[str, Any]] = []
+    # Round history as parallel columns: Move / RoundResult codes and epoch seconds.
+    # Server-side only; responses carry just the recent rounds via `history`
+    player1_moves: List[int] = Field(default=[], exclude=True)
+    player2_moves: List[int] = Field(default=[], exclude=True)
+    results: List[int] = Field(default=[], exclude=True)
+    timestamps: List[float] = Field(default=[], exclude=True)
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    def add_round(self, player1_move: str, player2_move: str, result: str, timestamp: datetime):
+        """Append one resolved round to the history columns"""
+        self.player1_moves.append(Move[player1_move.upper()])
+        self.player2_moves.append(Move[player2_move.upper()])
+        self.results.append(RoundResult[result.upper()])
+        self.timestamps.append(timestamp.timestamp())
+
+    @computed_field
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """The most recent rounds in the per-round shape clients expect"""
+        start = max(0, len(self.results) - _HISTORY_TAIL)
+        return [{
+            "round": i + 1,
+            "player1_move": Move(self.player1_moves[i]).name.lower(),
+            "player2_move": Move(self.player2_moves[i]).name.lower(),
+            "result": RoundResult(self.results[i]).name.lower(),
+            "timestamp": datetime.fromtimestamp(self.timestamps[i])
+        } for i in range(start, len(self.results))]
+
 class HandGesture(BaseModel):
     gesture: str
     confidence: float
     landmarks: List[List[float]]
 
+class GestureResponse(BaseModel):
+    gesture: str
+    confidence: float
+    detected: bool = False
+    message: Optional[str] = None
+    dropped: Optional[bool] = None
+    error: Optional[str] = None
+    landmarks: Optional[List[List[float]]] = None
+
+class BatchGestureRequest(BaseModel):
+    images: List[str] = Field(max_length=_MAX_BATCH_IMAGES)
+
 class AIResponse(BaseModel):
     move: str
     reasoning: Optional[str] = None
@@ -65,6 +65,7 @@ export const useWebcamGesture = ({
         gesture: result.gesture as 'rock' | 'paper' | 'scissors' | 'none',
         confidence: result.confidence || 0,
         detected: result.detected || false,
+        dropped: result.dropped || false,
         landmarks: result.landmarks || []
       };
 
@@ -112,7 +113,11 @@ export const useWebcamGesture = ({
 
   const captureGesture = useCallback(async (): Promise<HandGesture> => {
     try {
-      const gesture = await detectGesture();
+      let gesture = await detectGesture();
+      // A dropped frame was never classified, so try once more before settling
+      if (gesture.dropped) {
+        gesture = await detectGesture();
+      }
       setLastGesture(gesture);
       return gesture;
     } catch (err) {
@@ -11,7 +11,7 @@ export interface GameState {
   player1_score: number;
   player2_score: number;
   round_number: number;
-  history: GameRound[];
+  history: GameRound[];  // most recent rounds only
   created_at: string;
   updated_at?: string;
 }
@@ -35,6 +35,7 @@ export interface HandGesture {
   gesture: 'rock' | 'paper' | 'scissors' | 'none';
   confidence: number;
   detected: boolean;
+  dropped?: boolean;  // frame skipped by a busy recognizer, not a "none" answer
   landmarks?: number[][];
 }
 